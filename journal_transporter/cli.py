@@ -550,6 +550,13 @@ async def transfer(
         "--force",
         "-f",
         help="Run without prompts"
+    ),
+    concurrency: Optional[int] = typer.Option(
+        TransferHandler.FETCH_CONCURRENCY,
+        "--concurrency",
+        "-c",
+        min=1,
+        help="Number of GETs prefetched concurrently from the source server. Other requests are made on top of these"
     )
 ) -> None:
     """
@@ -599,16 +606,16 @@ async def transfer(
                                                 log=log,
                                                 on_error=on_error
                                                 )
-        handler = TransferHandler(data_directory,
-                                  source=source_def,
-                                  target=target_def,
-                                  progress_reporter=progress_reporter,
-                                  resume=resume
-                                  )
-
-        for method_name in transfer_methods:
-            method = getattr(handler, method_name)
-            method(journals)
+        with TransferHandler(data_directory,
+                             source=source_def,
+                             target=target_def,
+                             progress_reporter=progress_reporter,
+                             resume=resume,
+                             fetch_concurrency=concurrency
+                             ) as handler:
+            for method_name in transfer_methods:
+                method = getattr(handler, method_name)
+                method(journals)
     except AbortError:
         write("Operation aborted by user", line_break=True, theme="attention")
 
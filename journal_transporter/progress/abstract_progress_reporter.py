@@ -69,6 +69,8 @@ class AbstractProgressReporter(ABC):
         self.log_error = log in ["e", "error"]
         self.log_file = None
         self.needs_log_file = self.log_debug or self.log_error
+        # Debug messages can be expensive to build. Callers should check this before building them.
+        self.debug_enabled = self.debug_mode or self.log_debug
         self.on_error = on_error
         self.verbose_mode = verbose
         self.progress = start
@@ -1,16 +1,48 @@
 """Handler for HTTP connections to host servers. Subclass of AbstractConnection."""
 
-import json
 import requests
 
+from concurrent.futures import ThreadPoolExecutor
 from typing import Union
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+from journal_transporter.transfer import serialization
 from journal_transporter.transfer.abstract_connection import AbstractConnection
 
 
 class HTTPConnection(AbstractConnection):
 
-    def get(self, path: str, is_absolute: bool = False, **params) -> Union[list, dict]:
+    POOL_CONNECTIONS = 16
+    POOL_MAXSIZE = 64
+    MAX_RETRIES = Retry(total=3, backoff_factor=0.2)
+
+    # Maximum number of concurrent requests when POSTing a list of records
+    POST_CONCURRENCY = 8
+
+    def setup(self):
+        """
+        Builds a persistent session, so that connections to the host are kept alive and reused
+        rather than renegotiated on every request.
+        """
+        self.base_url = self.host.strip("/")
+        self.credentials = self.__credentials()
+        self.session = requests.Session()
+        self.post_executor = None
+
+        adapter = HTTPAdapter(pool_connections=self.POOL_CONNECTIONS, pool_maxsize=self.POOL_MAXSIZE,
+                              max_retries=self.MAX_RETRIES)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def close(self):
+        """Closes the session and any pooled connections."""
+        if self.post_executor is not None:
+            self.post_executor.shutdown()
+            self.post_executor = None
+        self.session.close()
+
+    def get(self, path: str, is_absolute: bool = False, stream: bool = False, **params) -> Union[list, dict]:
         """
         Submits a GET request to the connection.
 
@@ -19,15 +51,18 @@ class HTTPConnection(AbstractConnection):
                 The path to be appended to the server's "host" value
             is_absolute: bool
                 Is the URL absolute? If false, it will be combined with the host to build a full URL.
+            stream: bool
+                Should the body be left unread, to be consumed with iter_content? For large downloads.
             params: dict
                 Arbitrary parameters to be submitted as URL params
 
         Returns: Union[list, dict]
             The response JSON.
         """
-        url = path if is_absolute else f"{self.host.strip('/')}/{path.strip('/')}"
+        url = path if is_absolute else f"{self.base_url}/{path.strip('/')}"
         request_opts = self.__build_get_params(params)
-        response = requests.get(url, **request_opts)
+        if stream: request_opts["stream"] = True
+        response = self.session.get(url, **request_opts)
         return response
 
     def post(self, path: str, data) -> dict:
@@ -38,29 +73,32 @@ class HTTPConnection(AbstractConnection):
             path: str
                 The path to be appended to the server's "host" value
             data: Any
-                Any serializable content to be submitted as POST data.
+                Any serializable content to be submitted as POST data. If a list, each record
+                is POSTed separately (concurrently).
 
         Returns: Any
-            The response content.
+            The response, or a list of responses (in the same order as data) if data is a list.
+            Note that TransferHandler._do_push only sends single records (dicts), and expects a
+            single response.
         """
-        url = f"{self.host.strip('/')}/{path.strip('/')}/"
-        request_opts = self.__build_post_params(data.copy())
+        url = f"{self.base_url}/{path.strip('/')}/"
 
-        response = None
         if type(data) is list:
-            response = []
-            for index, record in enumerate(data):
-                response.append(requests.post(url, **request_opts))
-        else:
-            response = requests.post(url, **request_opts)
+            if self.post_executor is None:
+                self.post_executor = ThreadPoolExecutor(max_workers=self.POST_CONCURRENCY)
+            return list(self.post_executor.map(lambda record: self.__post_record(url, record), data))
 
-        return response
+        return self.__post_record(url, data)
 
     # Private
 
+    def __post_record(self, url: str, record: dict):
+        request_opts = self.__build_post_params(record.copy())
+        return self.session.post(url, **request_opts)
+
     def __build_get_params(self, params: dict = None) -> dict:
         ret = {
-            **self.__credentials(),
+            **self.credentials,
             "params": params
         }
 
@@ -76,9 +114,9 @@ class HTTPConnection(AbstractConnection):
                 data[key] = value
 
         ret = {
-            **self.__credentials(),
+            **self.credentials,
             "files": files,
-            data_key: {"json": json.dumps(data)} if files else data
+            data_key: {"json": serialization.dumps(data).decode("utf-8")} if files else data
         }
 
         return {k: v for (k, v) in ret.items() if v is not None}
@@ -0,0 +1,81 @@
+"""JSON (de)serialization helpers. Uses orjson when it is installed, else falls back to the stdlib."""
+# journal_transporter/transfer/serialization.py
+
+import json
+import mmap
+import os
+
+from pathlib import Path
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+# Files at least this large are memory-mapped rather than read into a buffer before parsing
+MMAP_THRESHOLD = 64 * 1024
+
+
+def loads(content: Union[bytes, bytearray, memoryview, str]) -> Any:
+    """
+    Parses JSON content.
+
+    Parameters:
+        content: Union[bytes, bytearray, memoryview, str]
+            The raw JSON. Bytes are preferred, as they can be parsed without decoding to str first.
+
+    Returns: Any
+        The parsed content
+    """
+    if orjson is not None:
+        return orjson.loads(content)
+
+    if isinstance(content, memoryview):
+        content = content.tobytes()
+    return json.loads(content)
+
+
+def dumps(data: Any, indent: bool = False) -> bytes:
+    """
+    Serializes data to JSON.
+
+    Parameters:
+        data: Any
+            JSON-able data.
+        indent: bool
+            Should the output be pretty-printed (2 space indent)?
+
+    Returns: bytes
+        UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else None)
+
+    return json.dumps(data, indent=2 if indent else None).encode("utf-8")
+
+
+def load_file(path: Union[Path, str]) -> Any:
+    """
+    Parses a JSON file.
+
+    Large files are memory-mapped and parsed in place, which avoids copying the whole file into
+    an intermediate buffer.
+
+    Parameters:
+        path: Union[Path, str]
+            The file to parse.
+
+    Returns: Any
+        The parsed content, or None if the file is empty
+    """
+    with open(path, "rb") as file:
+        size = os.fstat(file.fileno()).st_size
+        if not size:
+            return None
+        if orjson is None or size < MMAP_THRESHOLD:
+            return loads(file.read())
+
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with memoryview(mapped) as view:
+                return orjson.loads(view)
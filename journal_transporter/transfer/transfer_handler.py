@@ -3,14 +3,18 @@
 
 from pathlib import Path
 from datetime import datetime
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
-import json
+import hashlib
+import os
 import uuid
 import re
 import inflector
 
 from journal_transporter import __version__
 
+from journal_transporter.transfer import serialization
 from journal_transporter.transfer.http_connection import HTTPConnection
 from journal_transporter.transfer.exceptions import AbortError, ServerResponseError
 
@@ -39,6 +43,16 @@ class TransferHandler:
 
     DEFAULT_FETCH_POSTPROCESSOR = "_default_fetch_postprocessor"
 
+    # Index handlers that request nothing but the resource's index URL, so their responses can be prefetched
+    PREFETCHABLE_INDEX_HANDLERS = (DEFAULT_INDEX_HANDLER, "_index_roles")
+
+    # Number of GET requests that may be prefetched concurrently, and separately, the number of attachments
+    # that may be downloaded concurrently. Other requests are made on top of these.
+    FETCH_CONCURRENCY = 16
+
+    # Size of the chunks in which attachments are streamed to disk
+    FILE_CHUNK_SIZE = 64 * 1024
+
     # STRUCTURE
     #
     # Defines the resources to be indexed, fetched, and pulled.
@@ -191,6 +205,9 @@ class TransferHandler:
                 Connection information for the target server.
             progress: AbstractProgressReporter
                 A progress reporter instance that can be used to update the UI.
+            options: dict
+                fetch_concurrency: Number of GETs prefetched, and of attachments downloaded, concurrently
+                    (default FETCH_CONCURRENCY)
         """
         self.data_directory = Path(data_directory) / "current"
         self.source = source
@@ -201,8 +218,16 @@ class TransferHandler:
         self.source_connection = self.__connection_class(source)(**self.source) if source is not None else None
         self.target_connection = self.__connection_class(target)(**self.target) if target is not None else None
         self.inflector = inflector.English()
+        self.singular_names = {}
+        self.methods = {}
         self.error_context = None
         self.resume = resume
+        self.fetch_concurrency = options.get("fetch_concurrency") or self.FETCH_CONCURRENCY
+        self.executor = None
+        self.prefetched = {}
+        self.indexes = {}
+        self.writer = None
+        self.pending_writes = deque()
         if not dry_run: self.initialize_data_directory()
         if self.progress.needs_log_file: self.initialize_debug_log()
         assert self.metadata
@@ -219,7 +244,6 @@ class TransferHandler:
             self.metadata = self.__load_file_data(self.metadata_file)
             self.uuid = uuid.UUID(self.metadata.get("transaction_id"))
         else:
-            self.metadata_file.touch()
             now = datetime.now()
             self.uuid = uuid.uuid1()
 
@@ -230,16 +254,63 @@ class TransferHandler:
                 "initiated": now.isoformat()
             }
 
-            with open(self.metadata_file, "w") as file:
-                file.write(json.dumps(self.metadata))
+            with open(self.metadata_file, "wb") as file:
+                file.write(serialization.dumps(self.metadata, indent=True))
+
+        # Record UUIDs are version 5 UUIDs in the transaction's namespace. Hash the namespace once.
+        self.__uuid_namespace = hashlib.sha1(self.uuid.bytes)
+        self.uuids = {}
+        # UUIDs of users known to have been fetched, so their directories needn't be checked again
+        self.known_users = set()
 
     def initialize_debug_log(self):
         file_path = self.data_directory.parents[0] / f"log_{self.uuid}.txt"
         file_path.touch()
         self.progress.log_file = file_path
 
-    def finalize(self) -> None:
-        pass
+    def reset(self) -> None:
+        """
+        Discards in-memory state from any previous transfer and re-initializes the data directory.
+
+        Use after the data directory has been prepared for a new transfer.
+        """
+        self._finish_writes()
+        self.prefetched = {}
+        self.indexes = {}
+        self.error_context = None
+        self.initialize_data_directory()
+
+    def finalize(self, discard_writes: bool = False) -> None:
+        """
+        Releases any resources held by the source and target connections.
+
+        Parameters:
+            discard_writes: bool
+                Should pending attachment downloads be abandoned rather than completed? For use when
+                finalizing after an error.
+        """
+        try:
+            if self.executor is not None:
+                self.executor.shutdown(cancel_futures=True)
+                self.executor = None
+            self.prefetched = {}
+
+            if not discard_writes: self._finish_writes()
+        finally:
+            # Anything left over (i.e. if finishing was aborted) is abandoned
+            self._cancel_writes()
+            if self.writer is not None:
+                self.writer.shutdown()
+                self.writer = None
+
+            for connection in (self.source_connection, self.target_connection):
+                if connection is not None: connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *_args) -> None:
+        self.finalize(discard_writes=exc_type is not None)
 
     # Meta file management
 
@@ -251,22 +322,23 @@ class TransferHandler:
             data: dict
                 The new data to write to the file. Will be appended to the end.
         """
-        with open(self.metadata_file, "r") as file:
-            existing_content = json.loads(file.read())
-            self.metadata = {**existing_content, **data}
+        existing_content = serialization.load_file(self.metadata_file)
+        self.metadata = {**existing_content, **data}
 
-        self._replace_file_contents(self.metadata_file, self.metadata)
+        self._replace_file_contents(self.metadata_file, self.metadata, indent=True)
 
-    @staticmethod
-    def _replace_file_contents(file: Path, data: dict) -> None:
+    def _replace_file_contents(self, file: Path, data: dict, indent: bool = False) -> None:
         """
         Replaces the contents of a file with a JSON dump.
 
-        Useful for updating a file without messing up the formatting.
+        Data files are only read by the handler, so they are written compactly. Pass indent=True
+        for files meant to be read by people, such as the transfer metadata.
         """
-        with open(file, "w") as open_file:
+        self.indexes.pop(file, None)
+
+        with open(file, "wb") as open_file:
             open_file.seek(0)
-            open_file.write(json.dumps(data, indent=2))
+            open_file.write(serialization.dumps(data, indent=indent))
             open_file.truncate()
 
         return data
@@ -319,6 +391,7 @@ class TransferHandler:
 
         self.write_to_meta_file({f"{self.STAGE_INDEXING}_started": datetime.now().isoformat()})
         self._index(self.STRUCTURE, journal_paths=journal_paths)
+        self.prefetched = {}
         self.write_to_meta_file({f"{self.STAGE_INDEXING}_finished": datetime.now().isoformat()})
 
     def fetch_data(self, journal_paths: list) -> None:
@@ -346,6 +419,8 @@ class TransferHandler:
 
         self.write_to_meta_file({f"{self.STAGE_FETCHING}_started": datetime.now().isoformat()})
         self._fetch(self.STRUCTURE)
+        self.prefetched = {}
+        self._finish_writes()
         self.write_to_meta_file({f"{self.STAGE_FETCHING}_finished": datetime.now().isoformat()})
 
     def push_data(self, journal_paths: list) -> None:
@@ -399,9 +474,14 @@ class TransferHandler:
         """
         if self.source is None: return
 
-        self.progress.debug(f"GETting {url} with params {args}")
+        if self.progress.debug_enabled: self.progress.debug(f"GETting {url} with params {args}")
         try:
-            response = self.source_connection.get(url, is_absolute=is_url_absolute, **args)
+            prefetched = None if (is_url_absolute or args) else self.prefetched.pop(url, None)
+            if prefetched:
+                response = prefetched.result()
+            else:
+                response = self.source_connection.get(url, is_absolute=is_url_absolute,
+                                                      stream=(content_type == "file"), **args)
         except Exception as e:
             self.error_context = {
                 "message": "An error has occurred while attempting to fetch data",
@@ -413,7 +493,8 @@ class TransferHandler:
             raise e
 
         if response.ok:
-            self.progress.debug(f"{response}: {'File' if content_type == 'file' else response.text}")
+            if self.progress.debug_enabled:
+                self.progress.debug(f"{response}: {'File' if content_type == 'file' else response.text}")
             return self._handle_fetch_response(response, destination, filename, content_type, order)
 
         self.error_context = {
@@ -423,7 +504,11 @@ class TransferHandler:
             "content_type": content_type,
             "destination_file": str(destination)
         }
-        raise ServerResponseError(f"HTTP {response.status_code}: {response.text}")
+        try:
+            raise ServerResponseError(f"HTTP {response.status_code}: {response.text}", response)
+        finally:
+            # File responses are streamed, so release the connection
+            response.close()
 
     def _do_push(self, api_path: str, data: dict) -> None:
         """
@@ -441,7 +526,7 @@ class TransferHandler:
         if self.target is None:
             return
 
-        self.progress.debug(f"POSTing {api_path} with data {data}")
+        if self.progress.debug_enabled: self.progress.debug(f"POSTing {api_path} with data {data}")
 
         try:
             response = self.target_connection.post(api_path, data)
@@ -454,7 +539,7 @@ class TransferHandler:
             }
             return self.__handle_error(e, context)
 
-        self.progress.debug(f"{response}: {response.text}")
+        if self.progress.debug_enabled: self.progress.debug(f"{response}: {response.text}")
 
         if response.ok:
             return response.json()
@@ -467,6 +552,24 @@ class TransferHandler:
         }
         self.__handle_error(ServerResponseError(f"HTTP {response.status_code}: {response.text}", response), context)
 
+    def _prefetch(self, urls: list) -> None:
+        """
+        Submits GET requests for URLs to a thread pool, so that they are in flight while earlier
+        records are still being processed. The responses are picked up by _do_fetch.
+
+        Parameters:
+            urls: list
+                Paths (relative to the source host) to be fetched. None entries are skipped.
+        """
+        if self.source is None: return
+
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=self.fetch_concurrency)
+
+        for url in urls:
+            if url and url not in self.prefetched:
+                self.prefetched[url] = self.executor.submit(self.source_connection.get, url)
+
     def _handle_fetch_response(self, response, destination: Path, filename: str, content_type: str, order: bool):
         """
         Handes response from fetching data, based on content type.
@@ -491,8 +594,13 @@ class TransferHandler:
             The response content (if content_type is 'json', else None)
         """
         if content_type == "json":
-            content = response.json()
-            self.__assign_uuids(content)
+            raw = response.content
+            content = serialization.loads(raw)
+
+            # Content without source_record_keys is neither given UUIDs nor reordered, so the
+            # response can be written as-is rather than re-serialized.
+            needs_uuids = b'"source_record_key"' in raw
+            if needs_uuids: self.__assign_uuids(content)
             if order and (type(content) is list):
                 content = sorted(content, key=lambda d: d["source_record_key"])
 
@@ -504,22 +612,92 @@ class TransferHandler:
                 }
                 raise ServerResponseError("Server returned a blank response", response)
 
-            data = json.dumps(content, indent=2)
+            data = serialization.dumps(content) if needs_uuids else raw
 
-            with open(destination, "w") as f:
+            with open(destination, "wb") as f:
                 f.write(data)
-                self.progress.debug(f"Written to {f.name}")
+                if self.progress.debug_enabled: self.progress.debug(f"Written to {f.name}")
 
             return content
         elif content_type == "file":
-            if not filename:
-                content_disposition = response.headers.get("content-disposition")
-                if content_disposition:
-                    attachment_regex_result = re.search("filename=(.+)", content_disposition)
+            # The response is streamed, so it must be closed if it's never handed off to the writer
+            try:
+                if not filename:
+                    content_disposition = response.headers.get("content-disposition")
+                    attachment_regex_result = content_disposition and re.search("filename=(.+)", content_disposition)
                     filename = attachment_regex_result.group(1) if attachment_regex_result else "unknown_file"
 
-            with open(destination / filename, "wb") as f:
-                f.write(response.content)
+                file = destination / filename
+            except BaseException:
+                response.close()
+                raise
+
+            self._write_in_background(file, response)
+
+    def _write_in_background(self, file: Path, response) -> None:
+        """
+        Streams a response body to a file on a background thread, so that fetching can continue while
+        the download drains. Used for attachments, which are not read again until pushing.
+
+        Every queued response holds an open connection with its body unread, so no more are queued
+        than there are threads to download them; fetching waits on the oldest download instead.
+
+        Call _finish_writes before relying on the file.
+        """
+        if self.writer is None:
+            self.writer = ThreadPoolExecutor(max_workers=self.fetch_concurrency)
+
+        try:
+            future = self.writer.submit(self.__stream_to_file, file, response)
+        except BaseException:
+            response.close()
+            raise
+
+        self.pending_writes.append((file, response, future))
+        while len(self.pending_writes) > self.fetch_concurrency:
+            self.__await_write(*self.pending_writes.popleft())
+
+    def _finish_writes(self) -> None:
+        """Waits for all background writes to complete."""
+        while self.pending_writes:
+            self.__await_write(*self.pending_writes.popleft())
+
+    def _cancel_writes(self) -> None:
+        """
+        Abandons all background writes. Those not yet started are cancelled, and the responses of any
+        in progress are closed, which fails them (leaving no partial files behind).
+        """
+        while self.pending_writes:
+            _file, response, future = self.pending_writes.popleft()
+            future.cancel()
+            response.close()
+
+    def __stream_to_file(self, file: Path, response) -> None:
+        # Download next to the file, and only move it into place once complete, so that an
+        # interrupted download is never mistaken for a fetched file when resuming
+        partial = file.with_name(f"{file.name}.part")
+        try:
+            with open(partial, "wb") as f:
+                for chunk in response.iter_content(chunk_size=self.FILE_CHUNK_SIZE):
+                    f.write(chunk)
+            os.replace(partial, file)
+        except BaseException:
+            partial.unlink(missing_ok=True)
+            raise
+        finally:
+            response.close()
+
+    def __await_write(self, file: Path, response, future) -> None:
+        try:
+            future.result()
+        except Exception as err:
+            self.error_context = {
+                "message": "An error occurred while downloading a file",
+                "server": self.source,
+                "url": response.url,
+                "destination_file": str(file)
+            }
+            self.__handle_error(err)
 
     @staticmethod
     def __connection_class(server_def):
@@ -578,15 +756,15 @@ class TransferHandler:
 
             try:
                 if self.resume and (path / "index.json").exists():
-                    with open((path / "index.json"), "r") as file:
-                        content = file.read()
-                        if content:
-                            response = json.loads(content)
+                    response = serialization.load_file(path / "index.json")
 
                 if not response:
                     preprocessor(resource_name, definition, parents, path)
                     response = handler(path, url, **kwargs)
                     postprocessor(resource_name, definition, parents, path, response)
+
+                # Keep the index around so the fetch stage doesn't have to read it back from disk
+                if response: self.indexes[path / "index.json"] = response
             except Exception as err:
                 self.__handle_error(err, {
                     "message": f"An error occurred while indexing {resource_name}",
@@ -596,19 +774,49 @@ class TransferHandler:
                 })
 
             if response and "children" in definition:
-                progress_length = len(response) * len(definition.get("children", []))
+                children = definition["children"]
+                progress_length = len(response) * len(children)
                 self.__set_progress_length(parents, progress_length)
-                for thing in response:
+                prefetch_urls = self.__prefetchable_index_urls(parents, resource_name, response, children)
+                for index, thing in enumerate(response):
+                    start = index * len(children)
+                    self._prefetch(prefetch_urls[start:start + self.fetch_concurrency])
                     thing_path = path / thing["uuid"]
                     thing_path.mkdir(exist_ok=True)
                     for _j, (child_name, child_structure) in enumerate(definition["children"].items()):
                         new_parents = parents.copy()
-                        new_parents[resource_name] = thing
-                        new_parents[resource_name]["progress_key"] = definition.get("progress_key")
+                        new_parents[resource_name] = {**thing, "progress_key": definition.get("progress_key")}
                         self._index({child_name: child_structure}, new_parents)
 
             self.__increment_progress(parents, 1, f"Indexing {resource_name} complete!")
 
+    def __prefetchable_index_urls(self, parents: dict, resource_name: str, resources: list, children: dict) -> list:
+        """
+        Lists the index URLs of every child resource for each record in an index.
+
+        The list holds one entry per record per child, in the order they are indexed. Children that
+        are not indexed, use a custom handler that may request something else, or (when resuming)
+        already have an index file, are None.
+        """
+        prefetchable = [child_name for child_name, child_definition in children.items()
+                        if self.__is_prefetchable_index(child_definition.get("index"))]
+        ret = []
+
+        for resource in resources:
+            resource_parents = {**parents, resource_name: resource}
+            for child_name in children:
+                index_file = self._build_path(resource_parents, child_name) / "index.json"
+                if child_name not in prefetchable or (self.resume and index_file.exists()):
+                    ret.append(None)
+                else:
+                    ret.append(self._build_url(resource_parents, child_name))
+
+        return ret
+
+    def __is_prefetchable_index(self, config) -> bool:
+        if config is False: return False
+        return ((config or {}).get("handler") or self.DEFAULT_INDEX_HANDLER) in self.PREFETCHABLE_INDEX_HANDLERS
+
     def _fetch_index(self, path, url, **kwargs) -> list:
         """
         Default handler for fetching and writing index data.
@@ -631,8 +839,6 @@ class TransferHandler:
             content = self.__load_file_data(file)
             if content: return content
 
-        file.touch()
-
         return self._do_fetch(url, file, order=True)
 
     def _index_journals(self, path, url, **kwargs) -> list:
@@ -650,8 +856,6 @@ class TransferHandler:
             content = self.__load_file_data(file)
             if content: return content
 
-        file.touch()
-
         return self._do_fetch(url, file, order=True, paths=path_str)
 
     def _index_roles(self, path, url, **kwargs):
@@ -671,7 +875,6 @@ class TransferHandler:
             existing_user_keys = [d.get("source_record_key") for d in existing_users_index]
         else:
             existing_user_keys = []
-            users_index.touch()
 
         new_user_keys = [d["user"]["source_record_key"] for d in roles_index if d.get("user")]
         all_user_keys = list(set(existing_user_keys + new_user_keys))
@@ -722,14 +925,18 @@ class TransferHandler:
 
                 self.__increment_progress(parents, 1, f"Pushing {resource_name} complete!")
             else:
-                resource_stubs = self.__load_file_data(self._build_path(parents, resource_name) / "index.json")
+                resource_stubs = self.__load_index(parents, resource_name)
                 if not resource_stubs or not len(resource_stubs): return
 
                 children = definition.get("children", {})
                 progress_length = (len(resource_stubs) * (len(children) + 1)) if children else len(resource_stubs)
                 self.__set_progress_length(parents, progress_length)
 
-                for stub in resource_stubs:
+                prefetch_urls = self.__prefetchable_urls(parents, resource_name, resource_stubs, handler)
+
+                for index, stub in enumerate(resource_stubs):
+                    self._prefetch(prefetch_urls[index:index + self.fetch_concurrency])
+
                     path = self._build_path(parents, resource_name, stub)
                     url = self._build_url(parents, resource_name, stub)
                     response = None
@@ -754,6 +961,19 @@ class TransferHandler:
 
                 self.__increment_progress(parents, 1, f"Fetching {resource_name} complete!")
 
+    def __prefetchable_urls(self, parents: dict, resource_name: str, resource_stubs: list, handler) -> list:
+        """
+        Lists the detail URLs that the default fetch handler will request for a set of stubs.
+
+        Custom handlers may not request anything (or may request something else), so they
+        are not prefetched. When resuming, records that have already been fetched are None.
+        """
+        if handler.__name__ != self.DEFAULT_FETCH_HANDLER: return []
+
+        file_name = f"{self.__singularize(resource_name)}.json"
+        return [None if (self.resume and (self._build_path(parents, resource_name, stub) / file_name).exists())
+                else self._build_url(parents, resource_name, stub) for stub in resource_stubs]
+
     def _fetch_data(self, path, url, resource_name, _stub, **_kwargs):
         """
         Default handler for fetching detail data.
@@ -774,13 +994,11 @@ class TransferHandler:
             The fetched data
         """
         path.mkdir(exist_ok=True)
-        file = path / f"{self.inflector.singularize(resource_name)}.json"
+        file = path / f"{self.__singularize(resource_name)}.json"
 
         if self.resume and file.exists():
             return self.__load_file_data(file)
 
-        file.touch()
-
         return self._do_fetch(url, file)
 
     def _extract_from_index(self, path, _url, resource_name, stub, **_kwargs):
@@ -791,14 +1009,12 @@ class TransferHandler:
         entry in the index as if it were fetched from a detail view.
         """
         path.mkdir(exist_ok=True)
-        file = path / f"{self.inflector.singularize(resource_name)}.json"
+        file = path / f"{self.__singularize(resource_name)}.json"
 
         if self.resume and file.exists():
             data = self.__load_file_data(file)
             if data: return data
 
-        file.touch()
-
         return self._replace_file_contents(file, stub)
 
     def _fetch_files(self, path, url, _resource_name, stub, **_kwargs):
@@ -815,7 +1031,6 @@ class TransferHandler:
             metadata = self.__load_file_data(file)
             if metadata: return metadata
 
-        file.touch()
         self._replace_file_contents(file, stub)
 
         self._do_fetch(url, path, "file")
@@ -851,12 +1066,13 @@ class TransferHandler:
             fk_data = data.get(fk)
             if isinstance(fk_data, dict):
                 uuid = fk_data.get("uuid")
+                if uuid in self.known_users: continue
+
                 user_dir = self.data_directory / "users" / uuid
                 if not user_dir.exists():
                     path = self._build_path({}, "users", fk_data)
                     path.mkdir()
                     file = path / "user.json"
-                    file.touch()
                     url = self._build_url({}, "users", fk_data)
                     self._do_fetch(url, file)
 
@@ -868,6 +1084,8 @@ class TransferHandler:
                     })
                     self._replace_file_contents(users_index_file, users_index)
 
+                self.known_users.add(uuid)
+
     def _default_fetch_postprocessor(self, resource_name, definition, parents, path, data) -> None:
         """
         Fetches linked files and ensures user foreign keys.
@@ -922,7 +1140,7 @@ class TransferHandler:
             handler = self._get_handler(config, self.DEFAULT_PUSH_HANDLER)
             postprocessor = self._get_postprocessor("push", config)
 
-            resource_index = self.__load_file_data(self._build_path(parents, resource_name) / "index.json")
+            resource_index = self.__load_index(parents, resource_name)
             if not len(resource_index): return
 
             progress_length = len(resource_index) * len(definition.get("children", {}))
@@ -976,7 +1194,7 @@ class TransferHandler:
         fks = definition.get("foreign_keys")
         if fks:
             # Load data file for this resource
-            file_dir = path / f"{self.inflector.singularize(resource_name)}.json"
+            file_dir = path / f"{self.__singularize(resource_name)}.json"
             data = self.__load_file_data(file_dir)
 
             for fk_name, fk_resource in fks.items():
@@ -1015,7 +1233,7 @@ class TransferHandler:
 
         for subdir in path.iterdir():
             if subdir.is_dir() and subdir.name == fk_resource_name:
-                return subdir / fk_uuid / f"{self.inflector.singularize(fk_resource_name)}.json"
+                return subdir / fk_uuid / f"{self.__singularize(fk_resource_name)}.json"
 
         next_key, next_resource = list(parents_clone.items())[0]
         parents_clone.pop(next_key)
@@ -1031,7 +1249,7 @@ class TransferHandler:
         """
         form = parents["assignments"].get("review_form")
         if form:
-            response_detail_file = path / f"{self.inflector.singularize(resource_name)}.json"
+            response_detail_file = path / f"{self.__singularize(resource_name)}.json"
             response_detail = self.__load_file_data(response_detail_file)
             response_element = response_detail.get("review_form_element")
             if response_element:
@@ -1061,7 +1279,7 @@ class TransferHandler:
         Returns: dict
             Attributes of the object created on the target server
         """
-        data_file_name = f"{self.inflector.singularize(resource_name)}.json"
+        data_file_name = f"{self.__singularize(resource_name)}.json"
         file = path / data_file_name
         data = self.__load_file_data(file)
         files = [f for f in path.iterdir() if f.is_file() and f.name != data_file_name]
@@ -1143,7 +1361,7 @@ class TransferHandler:
 
     def _get_handler(self, config: dict = {}, fallback_method_name: str = None):
         method_name = config.get("handler") or fallback_method_name
-        return getattr(self, method_name) if method_name else None
+        return self.__method(method_name) if method_name else None
 
     def _get_preprocessor(self, action, config: dict = {}, fallback_method_name: str = None):
         if not fallback_method_name:
@@ -1151,7 +1369,7 @@ class TransferHandler:
                                     or getattr(self, "DEFAULT_PREPROCESSOR", None))  # noqa: W503
 
         method_name = config.get("preprocessor") or fallback_method_name
-        return getattr(self, method_name) if method_name else None
+        return self.__method(method_name) if method_name else None
 
     def _get_postprocessor(self, action, config: dict = {}, fallback_method_name: str = None):
         if not fallback_method_name:
@@ -1159,7 +1377,18 @@ class TransferHandler:
                                     or getattr(self, "DEFAULT_POSTPROCESSOR", None))  # noqa: W503
 
         method_name = config.get("postprocessor") or fallback_method_name
-        return getattr(self, method_name) if method_name else None
+        return self.__method(method_name) if method_name else None
+
+    def __method(self, method_name: str):
+        """
+        Looks up a handler, preprocessor or postprocessor by name.
+
+        These are resolved for every child of every record, so bound methods are cached by name.
+        """
+        method = self.methods.get(method_name)
+        if method is None:
+            method = self.methods[method_name] = getattr(self, method_name)
+        return method
 
     def _parent_path_segments(self, parents, key):
         """
@@ -1349,7 +1578,7 @@ class TransferHandler:
 
         for i, (parent_name, parent) in enumerate(parents.items()):
             item_name = parent.get(parent.get("progress_key") or "source_record_key").split(":")[-1]
-            message_parts.extend([self.inflector.singularize(parent_name), item_name])
+            message_parts.extend([self.__singularize(parent_name), item_name])
         message_parts = [x for x in message_parts if x]
         return " ".join(message_parts)
 
@@ -1387,27 +1616,69 @@ class TransferHandler:
 
         return None
 
+    def __singularize(self, name: str) -> str:
+        """
+        Singularizes a resource name.
+
+        The set of resource names is small and fixed, so results are cached rather than
+        running the inflector's rules each time.
+        """
+        singular = self.singular_names.get(name)
+        if singular is None:
+            singular = self.singular_names[name] = self.inflector.singularize(name)
+        return singular
+
+    def __load_index(self, parents: dict, resource_name: str) -> list:
+        """
+        Loads the index of a resource.
+
+        Indexes built earlier by this handler are served (once) from memory, else read from disk.
+        """
+        file = self._build_path(parents, resource_name) / "index.json"
+        index = self.indexes.pop(file, None)
+        return index if index is not None else self.__load_file_data(file)
+
     @staticmethod
     def __load_file_data(path):
-        with open(path) as file:
-            content = file.read()
-            if content:
-                return json.loads(content)
-
-        return None
+        """Parses a data file. Returns None if the file is empty or has not been written."""
+        try:
+            return serialization.load_file(path)
+        except FileNotFoundError:
+            return None
 
     def __assign_uuids(self, data):
-        if type(data) is list:
-            for entry in data:
-                self.__assign_uuids(entry)
-        elif type(data) is dict:
-            if data.get("source_record_key"):
-                data["uuid"] = self.__uuid(data["source_record_key"])
-            for (_key, value) in data.items():
-                self.__assign_uuids(value)
+        """
+        Adds a UUID to every dict with a source_record_key, at any depth within data.
+
+        Walks the data with an explicit stack rather than recursing, to avoid a function call per value.
+        """
+        stack = [data]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, list):
+                stack.extend(item)
+            elif isinstance(item, dict):
+                key = item.get("source_record_key")
+                if key:
+                    item["uuid"] = self.__uuid(key)
+                stack.extend(value for value in item.values() if isinstance(value, (list, dict)))
 
     def __uuid(self, key):
-        return str(uuid.uuid5(self.uuid, key))
+        """
+        Builds the same string as str(uuid.uuid5(self.uuid, key)), but reuses the hashed namespace
+        and skips building a UUID object. Results are cached, as the same keys (i.e. users) recur.
+        """
+        cached = self.uuids.get(key)
+        if cached: return cached
+
+        sha = self.__uuid_namespace.copy()
+        sha.update(key.encode("utf-8"))
+        digest = bytearray(sha.digest()[:16])
+        digest[6] = (digest[6] & 0x0F) | 0x50  # version 5
+        digest[8] = (digest[8] & 0x3F) | 0x80  # RFC 4122 variant
+        h = digest.hex()
+        ret = self.uuids[key] = f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+        return ret
 
     def __structure_depth(self, structure: dict) -> int:
         ret = 0
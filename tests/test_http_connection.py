@@ -0,0 +1,61 @@
+# transfer/tests/test_http_connection.py
+
+import pytest
+import random
+import requests
+import time
+
+from journal_transporter.transfer.http_connection import HTTPConnection
+
+# Constants
+
+SERVER = {
+    "host": "https://example.com/",
+    "username": "target_user",
+    "password": "target_password"
+}
+RECORDS = [{"source_record_key": f"journals:{i}", "title": f"Journal {i}"} for i in range(20)]
+
+
+# Helpers
+
+class MockPostResponse:
+
+    def __init__(self, url, **kwargs):
+        self.url = url
+        self.kwargs = kwargs
+        self.ok = True
+
+
+def mock_post(_session, url, **kwargs):
+    # Finish out of order, so ordering has to come from the connection rather than timing
+    time.sleep(random.uniform(0, 0.005))
+    return MockPostResponse(url, **kwargs)
+
+
+@pytest.fixture
+def connection(monkeypatch):
+    monkeypatch.setattr(requests.Session, "post", mock_post)
+    connection = HTTPConnection(**SERVER)
+    yield connection
+    connection.close()
+
+
+# Tests!
+
+def test_post_record(connection):
+    response = connection.post("/journals/", RECORDS[0])
+
+    assert response.url == "https://example.com/journals/"
+    assert response.kwargs == {"auth": ("target_user", "target_password"), "json": RECORDS[0]}
+
+
+def test_post_list(connection):
+    responses = connection.post("journals", RECORDS)
+
+    assert [r.kwargs["json"] for r in responses] == RECORDS
+    for response, record in zip(responses, RECORDS):
+        assert response.url == "https://example.com/journals/"
+        assert response.kwargs["auth"] == ("target_user", "target_password")
+        # Each record gets its own params, not a shared (mutated) dict
+        assert response.kwargs["json"] is not record
@@ -118,3 +118,10 @@ def test_debug(monkeypatch, progress=build_progress_reporter(debug=True)):
     assert progress.message != MAJOR_MESSAGE
     assert progress.progress_length != MAJOR_LENGTH
     assert debug == MAJOR_MESSAGE
+
+
+def test_debug_enabled():
+    assert build_progress_reporter().debug_enabled is False
+    assert build_progress_reporter(debug=True).debug_enabled is True
+    assert build_progress_reporter(log="d").debug_enabled is True
+    assert build_progress_reporter(log="e").debug_enabled is False
@@ -0,0 +1,80 @@
+# transfer/tests/test_serialization.py
+
+import mmap
+import pytest
+
+from journal_transporter.transfer import serialization
+
+# Constants
+
+RECORD = {"source_record_key": "journals:1", "title": "Zoë's Journal", "tags": ["a", "b"]}
+# Enough records to put the file over MMAP_THRESHOLD
+LARGE_DATA = [{**RECORD, "source_record_key": f"journals:{i}"} for i in range(2000)]
+
+
+# Helpers
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def backend(request, monkeypatch):
+    """Runs a test with orjson, and again with the stdlib json fallback."""
+    if request.param == "orjson":
+        if serialization.orjson is None: pytest.skip("orjson is not installed")
+    else:
+        monkeypatch.setattr(serialization, "orjson", None)
+    return request.param
+
+
+@pytest.fixture
+def mmap_calls(monkeypatch):
+    calls = []
+    original = mmap.mmap
+
+    def spy(*args, **kwargs):
+        calls.append(args)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(serialization.mmap, "mmap", spy)
+    return calls
+
+
+# Tests!
+
+def test_round_trip(backend):
+    assert serialization.loads(serialization.dumps(RECORD)) == RECORD
+    assert serialization.loads(serialization.dumps(RECORD).decode("utf-8")) == RECORD
+    assert serialization.loads(memoryview(serialization.dumps(RECORD))) == RECORD
+
+
+def test_dumps_indent(backend):
+    compact = serialization.dumps(RECORD)
+    indented = serialization.dumps(RECORD, indent=True)
+
+    assert isinstance(compact, bytes)
+    assert b"\n" not in compact
+    assert indented.startswith(b'{\n  "source_record_key"')
+    assert serialization.loads(indented) == RECORD
+
+
+def test_load_file_empty(backend, tmp_path):
+    file = tmp_path / "empty.json"
+    file.touch()
+
+    assert serialization.load_file(file) is None
+
+
+def test_load_file_small(backend, tmp_path, mmap_calls):
+    file = tmp_path / "small.json"
+    file.write_bytes(serialization.dumps(RECORD))
+
+    assert serialization.load_file(file) == RECORD
+    assert not mmap_calls
+
+
+def test_load_file_large(backend, tmp_path, mmap_calls):
+    file = tmp_path / "large.json"
+    file.write_bytes(serialization.dumps(LARGE_DATA))
+    assert file.stat().st_size >= serialization.MMAP_THRESHOLD
+
+    assert serialization.load_file(file) == LARGE_DATA
+    # Only orjson can parse in place, so the fallback reads the file normally
+    assert len(mmap_calls) == (1 if backend == "orjson" else 0)
@@ -1,46 +1,135 @@
 # transfer/tests/test_transfer_handler.py
 
-# All tests should only write files to the test/tmp directory,
-# which will be cleaned up automatically at the end of each test.
+# All tests should only write files to the tmp_root directory, which is created and
+# cleaned up by pytest.
 
+import collections
+import functools
 import inflector
 import json
+import os
 import pytest
 import requests
+import threading
+import uuid
 
 from pathlib import Path
 from typing import Union
 
-from journal_transporter import database
+from journal_transporter import config, database
+from journal_transporter.transfer import serialization
+from journal_transporter.transfer.exceptions import AbortError, ServerResponseError
 from journal_transporter.transfer.transfer_handler import TransferHandler
 
-from tests.shared import TMP_PATH
+# Constants
 
+SERVER = {
+    "type": "http",
+    "host": "https://example.com",
+    "username": "source_user",
+    "password": "source_password"
+}
+HOST_PREFIX = SERVER["host"] + "/"
+FIXTURE_DIR = str(Path(__file__).parent / "fixtures")
 
-@pytest.fixture(autouse=True)
-def setup_data_dir():
-    database.prepare()
+
+def list_fixtures() -> list:
+    """Walks the fixture directory, listing (request path, extension, file) for every fixture."""
+    ret = []
+    for root, _dirs, names in os.walk(FIXTURE_DIR):
+        for name in names:
+            stem, extension = os.path.splitext(name)
+            path = os.path.relpath(os.path.join(root, stem), FIXTURE_DIR).replace(os.sep, "/")
+            ret.append((path, extension, os.path.join(root, name)))
+
+    return ret
+
+
+def map_fixture_urls(fixtures: list) -> dict:
+    """
+    Maps every URL the mock server can answer to the fixture that answers it.
+
+    Attachments (anything under files/) are answered with the PDF; their JSON counterparts are only used by POSTs.
+    """
+    return {HOST_PREFIX + path: file for (path, extension, file) in fixtures
+            if extension == (".pdf" if "files/" in path else ".json")}
+
+
+FIXTURES = list_fixtures()
+URL_TO_FILE = map_fixture_urls(FIXTURES)
+
+# MockGetResponses are read-only once built, so they're shared across requests for the same URL
+GET_RESPONSES = {}
+
+
+@pytest.fixture(scope="module")
+def tmp_root(tmp_path_factory):
+    """A data directory (with its config file) for this module's tests, isolated per test run/worker."""
+    root = tmp_path_factory.mktemp("cdl_xfer")
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(config, "CONFIG_FILE_PATH", root / "config.ini")
+        config.create(root)
+        yield root
+
+
+@functools.lru_cache(maxsize=None)
+def load_fixture(path: str) -> bytes:
+    """Reads a fixture file. Cached, as the same fixtures are requested over and over."""
+    with open(path, "rb") as file:
+        return file.read()
+
+
+@functools.lru_cache(maxsize=None)
+def load_fixture_data(path: str) -> Union[dict, list]:
+    """Parses a JSON fixture. Cached and shared, so copy the result before changing it."""
+    return serialization.loads(load_fixture(path))
+
+
+@functools.lru_cache(maxsize=None)
+def load_fixture_records(path: str) -> dict:
+    """
+    Indexes an index fixture's records by source_record_key, for O(1) record lookups.
+    Like load_fixture_data, the result (and the records in it) is cached and shared, so copy before changing.
+    """
+    return {record["source_record_key"]: record for record in load_fixture_data(path)}
+
+
+@pytest.fixture(scope="module", autouse=True)
+def warm_fixtures():
+    """Reads (and parses, if JSON) every fixture up front, so malformed fixtures fail fast and loads are cached."""
+    for _path, extension, file in FIXTURES:
+        if extension != ".json":
+            load_fixture(file)
+            continue
+
+        try:
+            load_fixture_data(file)
+        except ValueError as err:
+            pytest.fail(f"Malformed fixture {file}: {err}")
 
 
 class MockGetResponse:
 
-    def __init__(self, path):
+    def __init__(self, path, fixture_path: str):
         self.inflector = inflector.English()
-        self.path = path.replace(server()["host"] + "/", "")
+        self.url = path
+        self.path = path.removeprefix(HOST_PREFIX)
         self.is_file = "files/" in self.path
 
         self.headers = {"content-disposition": "attachment; filename='1.pdf'" if self.is_file else ""}
 
-        extension = "pdf" if self.is_file else "json"
-        open_mode = "rb" if self.is_file else "r"
-        fixture_path = Path("tests/fixtures") / f"{self.path.rstrip('/')}.{extension}"
+        self.fixture_path = fixture_path
+        self.content = load_fixture(fixture_path)
 
-        with open(fixture_path, open_mode) as file:
-            self.content = file.read()
-        self.text = self.content
+        self.text = None if self.is_file else self.content.decode("utf-8")
+
+    def iter_content(self, chunk_size: int = 8192):
+        with open(self.fixture_path, "rb") as file:
+            while chunk := file.read(chunk_size):
+                yield chunk
 
-    def json(self) -> Union[dict, list]:
-        return json.loads(self.content)
+    def close(self) -> None:
+        pass
 
     def ok(self) -> bool:
         return True
@@ -50,53 +139,106 @@ class MockPostResponse(MockGetResponse):
 
     def __init__(self, path: Path, **kwargs):
         self.inflector = inflector.English()
-        self.path = path.replace(server()["host"] + "/", "")
+        self.path = path.removeprefix(HOST_PREFIX)
         self.data = kwargs.get("json") or kwargs.get("data")
+        # Multipart (file) POSTs carry the record serialized under a "json" form field
+        if "json" in self.data and isinstance(self.data["json"], str):
+            self.data = serialization.loads(self.data["json"])
         key = self.data["source_record_key"].split(":")[-1]
 
-        fixture_path = Path("tests/fixtures") / f"{self.path.rstrip('/')}/{key}.json"
-        if fixture_path.exists():
-            with open(fixture_path, "r") as file:
-                self.content = file.read()
+        resource_dir = os.path.join(FIXTURE_DIR, self.path.rstrip("/"))
+        fixture_path = os.path.join(resource_dir, f"{key}.json")
+        if os.path.exists(fixture_path):
+            self.record = load_fixture_data(fixture_path)
         else:
-            fixture_path = fixture_path.parents[1] / f"{self.inflector.singularize(fixture_path.parent.name)}.json"
-            with open(fixture_path, "r") as file:
-                index_content = json.loads(file.read())
-                the_one = next(x for x in index_content if x["source_record_key"] == self.data["source_record_key"])
-                self.content = json.dumps(the_one)
+            parent_dir, resource_name = os.path.split(resource_dir)
+            fixture_path = os.path.join(parent_dir, f"{self.inflector.singularize(resource_name)}.json")
+            self.record = load_fixture_records(fixture_path)[self.data["source_record_key"]]
 
+        self.content = serialization.dumps(self.record).decode("utf-8")
         self.text = self.content
 
     def json(self) -> dict:
-        content = json.loads(self.content)
-        content["source_record_key"] = f"{self.path.rstrip('/').split('/')[-1]}:1"
-        return content
+        # Only the top-level source_record_key changes, so a shallow copy keeps the cached record intact
+        return {**self.record, "source_record_key": f"{self.path.rstrip('/').split('/')[-1]}:1"}
+
+
+class MockStreamedResponse:
+    """A streamed (attachment) response that is never read; tracks whether it has been released."""
+
+    def __init__(self, ok: bool = True, headers: dict = None, chunks: tuple = (), error: Exception = None):
+        self.url = HOST_PREFIX + "journals/1/articles/1/files/1-1"
+        self.ok = ok
+        self.status_code = 200 if ok else 500
+        self.text = "Server Error"
+        self.headers = headers or {}
+        self.chunks = chunks
+        self.error = error
+        self.closed = False
+
+    def iter_content(self, chunk_size: int = 8192):
+        yield from self.chunks
+        if self.error: raise self.error
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class MockStalledResponse(MockStreamedResponse):
+    """A download that stalls until it's closed (or times out), and fails if it was closed."""
+
+    def __init__(self):
+        super().__init__()
+        self.released = threading.Event()
+
+    def iter_content(self, chunk_size: int = 8192):
+        self.released.wait(timeout=5)
+        if self.closed: raise requests.exceptions.ConnectionError("Connection closed")
+        yield b"%PDF-1.4"
+
+    def close(self) -> None:
+        self.closed = True
+        self.released.set()
 
 
 # Helpers
 
-def server():
-    return {
-        "type": "http",
-        "host": "https://example.com",
-        "username": "source_user",
-        "password": "source_password"
-    }
+@pytest.fixture(scope="module")
+def handler(tmp_root):
+    database.prepare()
+    handler = TransferHandler(tmp_root, source=SERVER, target=SERVER)
+    yield handler
+    handler.finalize()
 
 
 @pytest.fixture
-def handler():
-    return TransferHandler(TMP_PATH, source=server(), target=server())
+def db(handler):
+    """A fresh current/ data directory, and a handler with no state from previous tests."""
+    database.prepare()
+    handler.reset()
 
 
-def mock_get(path, *args, **kwargs):
-    return MockGetResponse(path)
+def mock_get(_session, path, *args, **kwargs):
+    response = GET_RESPONSES.get(path)
+    if response is None:
+        # A KeyError here means there's no fixture for the requested URL
+        response = GET_RESPONSES[path] = MockGetResponse(path, URL_TO_FILE[path.rstrip("/")])
+    return response
 
 
-def mock_post(path, *args, **kwargs):
+def mock_post(_session, path, *args, **kwargs):
     return MockPostResponse(path, **kwargs)
 
 
+@pytest.fixture(scope="module", autouse=True)
+def mock_requests():
+    """Routes all requests made by the handler's connections to the test doubles."""
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(requests.Session, "get", mock_get)
+        monkeypatch.setattr(requests.Session, "post", mock_post)
+        yield
+
+
 def assert_target_record_key(structure, path):
     if not structure: return
 
@@ -105,8 +247,8 @@ def assert_target_record_key(structure, path):
         detail_file = path / f"{inflector.English().singularize(resource)}.json"
 
         if detail_file.exists():
-            with open(detail_file) as file:
-                content = json.loads(file.read())
+            with open(detail_file, "rb") as file:
+                content = json.load(file)
                 content_list = content if isinstance(content, list) else [content]
                 for dict in content_list:
                     assert dict.get("target_record_key")
@@ -118,16 +260,16 @@ def ensure_children_exist(start_path, structure, assert_detail_files=False, asse
     index_path = start_path / "index.json"
     assert index_path.exists()
 
-    with open(index_path) as index:
-        parsed_index = json.loads(index.read())
+    with open(index_path, "rb") as index:
+        parsed_index = json.load(index)
         for resource in parsed_index:
             resource_path = start_path / resource["uuid"]
             if assert_detail_files:
                 assert (resource_path / f"{inflector.English().singularize(start_path.name)}.json").exists()
             if assert_target_record_keys:
                 detail_file = (resource_path / f"{inflector.English().singularize(start_path.name)}.json")
-                with open(detail_file) as detail:
-                    parsed_detail = json.loads(detail.read())
+                with open(detail_file, "rb") as detail:
+                    parsed_detail = json.load(detail)
                     detail_list = parsed_detail if isinstance(parsed_detail, list) else [parsed_detail]
                     for detail_dict in detail_list:
                         assert detail_dict.get("target_record_key")
@@ -141,56 +283,156 @@ def ensure_children_exist(start_path, structure, assert_detail_files=False, asse
 
 # Tests!
 
-def test_setup(handler):
-    assert Path(TMP_PATH).exists()
+def test_setup(tmp_root):
+    database.prepare()
+    with TransferHandler(tmp_root, source=SERVER, target=SERVER) as handler:
+        metadata_file = tmp_root / "current" / "index.json"
+        assert metadata_file.exists()
+        assert serialization.load_file(metadata_file)["transaction_id"] == str(handler.uuid)
+
 
+@pytest.mark.parametrize("key", ["journals:1", "authors:Zoë Ñúñez 書誌", "files:" + "x" * 4096])
+def test_uuid_matches_uuid5(handler, key):
+    # UUIDs name the data directories, so they must match uuid5 exactly for --resume to find them
+    expected = str(uuid.uuid5(handler.uuid, key))
+    assert handler._TransferHandler__uuid(key) == expected
+    assert handler._TransferHandler__uuid(key) == expected
 
-def test_index(monkeypatch, handler):
-    monkeypatch.setattr(requests, "get", mock_get)
 
+def test_index(db, handler, tmp_root):
     structure = handler.STRUCTURE
 
     handler.fetch_indexes([])
 
     for (k, v) in structure.items():
-        ensure_children_exist((TMP_PATH / "current" / k), v)
-
-
-def test_fetch_gate(monkeypatch, handler):
-    monkeypatch.setattr(requests, "get", mock_get)
-    with pytest.raises(AssertionError):
-        handler.fetch_data([])
+        ensure_children_exist((tmp_root / "current" / k), v)
 
 
-def test_fetch(monkeypatch, handler):
-    monkeypatch.setattr(requests, "get", mock_get)
-
+def test_fetch(db, handler, tmp_root):
     structure = handler.STRUCTURE
 
     handler.fetch_indexes([])
     handler.fetch_data([])
 
     for (k, v) in structure.items():
-        ensure_children_exist((TMP_PATH / "current" / k), v, assert_detail_files=True)
+        ensure_children_exist((tmp_root / "current" / k), v, assert_detail_files=True)
+
+    # The attachment is named by the mocked content-disposition header
+    attachments = list((tmp_root / "current").glob("journals/*/articles/*/files/*/'1.pdf'"))
+    assert len(attachments) == 1
+    assert attachments[0].read_bytes() == load_fixture(URL_TO_FILE[HOST_PREFIX + "journals/1/articles/1/files/1-1"])
+
 
+def test_each_url_fetched_once(db, handler):
+    # Prefetched responses must be picked up by _do_fetch, or every GET would be made twice
+    counts = collections.Counter()
+    lock = threading.Lock()
 
-def test_push_gate(monkeypatch, handler):
-    monkeypatch.setattr(requests, "get", mock_get)
+    def counting_get(session, path, *args, **kwargs):
+        with lock:
+            counts[path] += 1
+        return mock_get(session, path, *args, **kwargs)
+
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(requests.Session, "get", counting_get)
+        handler.fetch_indexes([])
+        handler.fetch_data([])
+
+    assert counts
+    assert {url: count for url, count in counts.items() if count != 1} == {}
+
+
+@pytest.mark.parametrize("stage", ["fetch_data", "push_data"])
+def test_stage_gate(db, handler, stage):
     with pytest.raises(AssertionError):
-        handler.push_data([])
+        getattr(handler, stage)([])
+
+
+def test_streamed_response_closed_on_error(db, handler, tmp_root):
+    response = MockStreamedResponse(ok=False)
+
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(handler.source_connection, "get", lambda *args, **kwargs: response)
+        with pytest.raises(ServerResponseError):
+            handler._do_fetch("journals/1/articles/1/files/1-1", tmp_root / "current", "file")
+
+    assert response.closed
+
+
+def test_attachment_without_content_disposition(db, handler, tmp_root):
+    response = MockStreamedResponse(headers={}, chunks=(b"%PDF-", b"1.4"))
+
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(handler.source_connection, "get", lambda *args, **kwargs: response)
+        handler._do_fetch("journals/1/articles/1/files/1-1", tmp_root / "current", "file")
+        handler._finish_writes()
+
+    assert (tmp_root / "current" / "unknown_file").read_bytes() == b"%PDF-1.4"
+    assert response.closed
+
+
+def test_interrupted_download_leaves_no_file(db, handler, tmp_root):
+    file = tmp_root / "current" / "1.pdf"
+    response = MockStreamedResponse(chunks=(b"0123456789",), error=requests.exceptions.ChunkedEncodingError())
+
+    handler._write_in_background(file, response)
+    handler._finish_writes()
+
+    # Nothing that --resume could mistake for a complete download
+    assert not file.exists()
+    assert not file.with_name("1.pdf.part").exists()
+    assert response.closed
+
+
+def test_exit_on_error_abandons_downloads(tmp_root):
+    database.prepare()
+    responses = [MockStalledResponse() for _ in range(3)]
+
+    with pytest.raises(RuntimeError):
+        with TransferHandler(tmp_root, source=SERVER, target=SERVER) as handler:
+            for i, response in enumerate(responses):
+                handler._write_in_background(tmp_root / "current" / f"{i}.pdf", response)
+            raise RuntimeError("Transfer failed")
+
+    # Closed rather than drained, so nothing was written
+    assert all(response.closed for response in responses)
+    assert not list((tmp_root / "current").glob("*.pdf*"))
+
+
+def test_finalize_releases_connections_when_aborted(tmp_root):
+    database.prepare()
+    handler = TransferHandler(tmp_root, source=SERVER, target=SERVER)
+    response = MockStreamedResponse(error=requests.exceptions.ChunkedEncodingError())
+    handler._write_in_background(tmp_root / "current" / "1.pdf", response)
+
+    contexts = []
+    closed = []
+
+    def abort(_error, context):
+        # The user chooses to abort when the download fails
+        contexts.append(context)
+        return "abort"
+
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(handler.progress, "report_error", abort)
+        for connection in (handler.source_connection, handler.target_connection):
+            monkeypatch.setattr(connection, "close", lambda connection=connection: closed.append(connection))
+
+        with pytest.raises(AbortError):
+            handler.finalize()
 
+    assert contexts[0]["url"] == response.url
+    assert len(closed) == 2
+    assert handler.writer is None
 
-def test_push(monkeypatch, handler):
-    monkeypatch.setattr(requests, "get", mock_get)
-    monkeypatch.setattr(requests, "post", mock_post)
 
+def test_push(db, handler, tmp_root):
     handler.fetch_indexes([])
     handler.fetch_data([])
     handler.push_data([])
 
     structure = handler.STRUCTURE
     for (k, v) in structure.items():
-        ensure_children_exist((TMP_PATH / "current" / k), v, assert_target_record_keys=True)
+        ensure_children_exist((tmp_root / "current" / k), v, assert_target_record_keys=True)
 
-    path = TMP_PATH
-    assert_target_record_key(TransferHandler.STRUCTURE, path)
+    assert_target_record_key(TransferHandler.STRUCTURE, tmp_root)